@@ -1,16 +1,32 @@
 import os
 import re
 import html
+import base64
+import struct
+import asyncio
 import logging
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 import httpx
+import orjson
 import asyncpg
-from telegram import Update, BotCommand, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, ContextTypes, CallbackQueryHandler
+from cachetools import TTLCache
+from telegram import (
+    Update, BotCommand, InlineKeyboardButton, InlineKeyboardMarkup, LinkPreviewOptions
+)
+from telegram.ext import (
+    Application, CommandHandler, ContextTypes, CallbackQueryHandler, AIORateLimiter
+)
 from telegram.error import TelegramError
 
+# uvloop : boucle d'événements libuv, ~2x plus rapide que l'asyncio par défaut
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
 # --- CONFIGURATION & LOGGING ---
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -40,10 +56,8 @@ def parse_owner_ids() -> set[int]:
         raise ValueError("❌ OWNER_IDS ou OWNER_ID requis")
     
     try:
-        ids = set()
-        for part in re.split(r"[,\s]+", owner_ids_str):
-            if part:
-                ids.add(int(part))
+        # str.split sans argument gère les espaces ; on normalise juste les virgules
+        ids = {int(part) for part in owner_ids_str.replace(",", " ").split()}
         if not ids:
             raise ValueError("❌ Aucun ID valide trouvé")
         return ids
@@ -62,13 +76,21 @@ if not DATABASE_URL:
 if not WEBHOOK_URL and ENVIRONMENT == "production":
     raise ValueError("❌ WEBHOOK_URL est requis en production")
 
-logger.info(f"✅ {len(AUTHORIZED_USER_IDS)} utilisateur(s) autorisé(s)")
+logger.info("✅ %d utilisateur(s) autorisé(s)", len(AUTHORIZED_USER_IDS))
 
 # Pool de connexions PostgreSQL
 db_pool = None
 
-# Cache en mémoire
-_cache = {}
+# Client HTTP partagé (keep-alive + pool de connexions)
+http_client: Optional[httpx.AsyncClient] = None
+
+# Caches en mémoire (bornés, avec expiration)
+_search_cache = TTLCache(maxsize=2048, ttl=300)      # résultats de recherche (volatils)
+_details_cache = TTLCache(maxsize=4096, ttl=86400)   # détails de films (quasi statiques)
+
+# Sélections en attente d'un clic, clé (user_id, type de média). Borné
+# et expirant : une recherche abandonnée ne traîne pas jusqu'au restart.
+PENDING = TTLCache(maxsize=10000, ttl=600)
 
 # --- TRADUCTIONS ---
 TRANSLATIONS = {
@@ -236,344 +258,660 @@ TRANSLATIONS = {
     }
 }
 
+# --- HTTP ---
+async def init_http_client():
+    """Initialise le client HTTP partagé (évite un handshake TCP+TLS par requête)."""
+    global http_client
+    http_client = httpx.AsyncClient(
+        # Budgets séparés : détecter un pair mort en 3 s plutôt que 15 s
+        timeout=httpx.Timeout(connect=3.0, read=8.0, write=3.0, pool=2.0),
+        # Le transport explicite porte le pool, HTTP/2 et 2 retries sur
+        # les erreurs de connexion transitoires (reset TCP, etc.)
+        transport=httpx.AsyncHTTPTransport(
+            retries=2,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30)
+        ),
+        headers={"Accept": "application/json"}
+    )
+    logger.info("✅ Client HTTP partagé initialisé")
+
 # --- DATABASE ---
+# Requêtes hoistées en constantes : un texte stable permet à asyncpg de
+# réutiliser ses prepared statements (cache par connexion).
+_SQL_GET_SETTINGS = "SELECT language, footer FROM user_settings WHERE user_id = $1"
+
+_SQL_DEFAULT_SETTINGS = "INSERT INTO user_settings (user_id) VALUES ($1) ON CONFLICT DO NOTHING"
+
+_SQL_SET_LANGUAGE = """
+    INSERT INTO user_settings (user_id, language, updated_at)
+    VALUES ($1, $2, NOW())
+    ON CONFLICT (user_id)
+    DO UPDATE SET language = $2, updated_at = NOW()
+"""
+
+_SQL_SET_FOOTER = """
+    INSERT INTO user_settings (user_id, footer, updated_at)
+    VALUES ($1, $2, NOW())
+    ON CONFLICT (user_id)
+    DO UPDATE SET footer = $2, updated_at = NOW()
+"""
+
+# Paramètres + compteur de recherches en un seul aller-retour. Le
+# DO UPDATE factice sert uniquement à obtenir RETURNING sur les
+# lignes déjà existantes.
+_SQL_SETTINGS_AND_INCREMENT = """
+    WITH u AS (
+        INSERT INTO user_settings (user_id)
+        VALUES ($1)
+        ON CONFLICT (user_id) DO UPDATE SET user_id = EXCLUDED.user_id
+        RETURNING language, footer
+    ), s AS (
+        UPDATE global_stats
+        SET value = value + 1, updated_at = NOW()
+        WHERE key = 'total_searches'
+    )
+    SELECT language, footer FROM u
+"""
+
 async def init_db():
     """Initialise la base de données PostgreSQL."""
     global db_pool
-    db_pool = await asyncpg.create_pool(DATABASE_URL, min_size=1, max_size=10)
-    
-    async with db_pool.acquire() as conn:
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS user_settings (
-                user_id BIGINT PRIMARY KEY,
-                language VARCHAR(5) DEFAULT 'fr',
-                footer TEXT DEFAULT '@WorldZPrime',
-                created_at TIMESTAMP DEFAULT NOW(),
-                updated_at TIMESTAMP DEFAULT NOW()
-            )
-        """)
-        
-        await conn.execute("""
-            CREATE TABLE IF NOT EXISTS global_stats (
-                key VARCHAR(50) PRIMARY KEY,
-                value BIGINT DEFAULT 0,
-                updated_at TIMESTAMP DEFAULT NOW()
-            )
-        """)
-        
-        # Initialiser les stats globales
-        await conn.execute("""
-            INSERT INTO global_stats (key, value) 
-            VALUES ('total_searches', 0)
-            ON CONFLICT (key) DO NOTHING
-        """)
+    db_pool = await asyncpg.create_pool(
+        DATABASE_URL,
+        min_size=5,
+        max_size=20,
+        max_inactive_connection_lifetime=300,
+        max_queries=50000,
+        # Cache de prepared statements par connexion : nos requêtes sont
+        # toutes des constantes hoistées, autant les préparer une fois
+        statement_cache_size=1024,
+        command_timeout=10
+    )
     
+    # Un seul aller-retour : asyncpg accepte un script multi-instructions
+    # quand il n'y a pas de paramètres.
+    await db_pool.execute("""
+        CREATE TABLE IF NOT EXISTS user_settings (
+            user_id BIGINT PRIMARY KEY,
+            language VARCHAR(5) DEFAULT 'fr',
+            footer TEXT DEFAULT '@WorldZPrime',
+            created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        CREATE TABLE IF NOT EXISTS global_stats (
+            key VARCHAR(50) PRIMARY KEY,
+            value BIGINT DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT NOW()
+        );
+
+        INSERT INTO global_stats (key, value)
+        VALUES ('total_searches', 0)
+        ON CONFLICT (key) DO NOTHING;
+    """)
+
+    global _stats_flush_task
+    _stats_flush_task = asyncio.create_task(_stats_flush_loop())
+
     logger.info("✅ Base de données PostgreSQL initialisée")
 
+# Les paramètres changent rarement et seuls les IDs autorisés passent les
+# handlers : un simple dict en mémoire suffit, invalidé à chaque écriture.
+_user_settings_cache: Dict[int, Dict[str, Any]] = {}
+
 async def get_user_settings(user_id: int) -> Dict[str, Any]:
     """Récupère les paramètres d'un utilisateur."""
-    async with db_pool.acquire() as conn:
-        row = await conn.fetchrow(
-            "SELECT language, footer FROM user_settings WHERE user_id = $1",
-            user_id
-        )
-        if row:
-            return {"language": row["language"], "footer": row["footer"]}
-        
-        # Créer les paramètres par défaut
-        await conn.execute(
-            "INSERT INTO user_settings (user_id) VALUES ($1) ON CONFLICT DO NOTHING",
-            user_id
-        )
-        return {"language": "fr", "footer": "@WorldZPrime"}
+    cached = _user_settings_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    row = await db_pool.fetchrow(_SQL_GET_SETTINGS, user_id)
+    if row:
+        settings = {"language": row["language"], "footer": row["footer"]}
+        _user_settings_cache[user_id] = settings
+        return settings
+
+    # Créer les paramètres par défaut hors du chemin critique :
+    # la réponse n'a pas besoin d'attendre cette écriture.
+    asyncio.create_task(db_pool.execute(_SQL_DEFAULT_SETTINGS, user_id))
+    settings = {"language": "fr", "footer": "@WorldZPrime"}
+    _user_settings_cache[user_id] = settings
+    return settings
 
 async def update_user_language(user_id: int, language: str):
     """Met à jour la langue d'un utilisateur."""
-    async with db_pool.acquire() as conn:
-        await conn.execute("""
-            INSERT INTO user_settings (user_id, language, updated_at)
-            VALUES ($1, $2, NOW())
-            ON CONFLICT (user_id) 
-            DO UPDATE SET language = $2, updated_at = NOW()
-        """, user_id, language)
+    await db_pool.execute(_SQL_SET_LANGUAGE, user_id, language)
+    settings = _user_settings_cache.get(user_id)
+    if settings is not None:
+        settings["language"] = language
 
 async def update_user_footer(user_id: int, footer: str):
     """Met à jour le footer d'un utilisateur."""
-    async with db_pool.acquire() as conn:
-        await conn.execute("""
-            INSERT INTO user_settings (user_id, footer, updated_at)
-            VALUES ($1, $2, NOW())
-            ON CONFLICT (user_id) 
-            DO UPDATE SET footer = $2, updated_at = NOW()
-        """, user_id, footer)
+    await db_pool.execute(_SQL_SET_FOOTER, user_id, footer)
+    settings = _user_settings_cache.get(user_id)
+    if settings is not None:
+        settings["footer"] = footer
+
+async def get_settings_and_increment(user_id: int) -> Dict[str, Any]:
+    """Récupère les paramètres et incrémente total_searches en un aller-retour."""
+    cached = _user_settings_cache.get(user_id)
+    if cached is not None:
+        await increment_stat("total_searches")
+        return cached
+
+    row = await db_pool.fetchrow(_SQL_SETTINGS_AND_INCREMENT, user_id)
+    settings = {"language": row["language"], "footer": row["footer"]}
+    _user_settings_cache[user_id] = settings
+    return settings
+
+# Compteurs agrégés en mémoire puis poussés par lots : une écriture
+# par fenêtre de 10 s au lieu d'un UPSERT par recherche.
+_pending_stats: Dict[str, int] = {}
+_stats_flush_task: Optional["asyncio.Task"] = None
+_STATS_FLUSH_INTERVAL = 10
+
+_SQL_FLUSH_STAT = """
+    INSERT INTO global_stats (key, value, updated_at)
+    VALUES ($1, $2, NOW())
+    ON CONFLICT (key)
+    DO UPDATE SET value = global_stats.value + $2, updated_at = NOW()
+"""
 
 async def increment_stat(key: str):
-    """Incrémente une statistique globale."""
-    async with db_pool.acquire() as conn:
-        await conn.execute("""
-            INSERT INTO global_stats (key, value, updated_at)
-            VALUES ($1, 1, NOW())
-            ON CONFLICT (key) 
-            DO UPDATE SET value = global_stats.value + 1, updated_at = NOW()
-        """, key)
+    """Incrémente une statistique globale (agrégée en mémoire)."""
+    _pending_stats[key] = _pending_stats.get(key, 0) + 1
+
+async def _flush_pending_stats():
+    """Pousse les compteurs en attente vers PostgreSQL."""
+    if not _pending_stats:
+        return
+    snapshot = dict(_pending_stats)
+    _pending_stats.clear()
+    for key, count in snapshot.items():
+        await db_pool.execute(_SQL_FLUSH_STAT, key, count)
+
+async def _stats_flush_loop():
+    """Tâche de fond : flush périodique des statistiques."""
+    while True:
+        await asyncio.sleep(_STATS_FLUSH_INTERVAL)
+        try:
+            await _flush_pending_stats()
+        except Exception:
+            logger.exception("Échec du flush des statistiques")
 
 async def get_global_stats() -> Dict[str, int]:
     """Récupère toutes les statistiques globales."""
-    async with db_pool.acquire() as conn:
-        rows = await conn.fetch("SELECT key, value FROM global_stats")
-        return {row["key"]: row["value"] for row in rows}
+    rows = await db_pool.fetch("SELECT key, value FROM global_stats")
+    stats = {row["key"]: row["value"] for row in rows}
+    # Inclure ce qui n'a pas encore été flushé
+    for key, count in _pending_stats.items():
+        stats[key] = stats.get(key, 0) + count
+    return stats
 
 # --- UTILITAIRES ---
 def t(key: str, lang: str = "fr", **kwargs) -> str:
     """Traduit une clé dans la langue spécifiée."""
-    text = TRANSLATIONS.get(lang, TRANSLATIONS["fr"]).get(key, key)
+    # `or` évite d'évaluer le fallback français sur le chemin fréquent
+    text = (TRANSLATIONS.get(lang) or TRANSLATIONS["fr"]).get(key, key)
     return text.format(**kwargs) if kwargs else text
 
+# Table de translittération construite une seule fois à l'import
+_BOLD_TABLE = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789",
+    "𝗔𝗕𝗖𝗗𝗘𝗙𝗚𝗛𝗜𝗝𝗞𝗟𝗠𝗡𝗢𝗣𝗤𝗥𝗦𝗧𝗨𝗩𝗪𝗫𝗬𝗭𝗮𝗯𝗰𝗱𝗲𝗳𝗴𝗵𝗶𝗷𝗸𝗹𝗺𝗻𝗼𝗽𝗾𝗿𝘀𝘁𝘂𝘃𝘄𝘅𝘆𝘇𝟬𝟭𝟮𝟯𝟰𝟱𝟲𝟳𝟴𝟵"
+)
+
 def bold(text: str) -> str:
     """Convertit le texte en caractères Unicode gras."""
-    normal = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-    bold_chars = "𝗔𝗕𝗖𝗗𝗘𝗙𝗚𝗛𝗜𝗝𝗞𝗟𝗠𝗡𝗢𝗣𝗤𝗥𝗦𝗧𝗨𝗩𝗪𝗫𝗬𝗭𝗮𝗯𝗰𝗱𝗲𝗳𝗴𝗵𝗶𝗷𝗸𝗹𝗺𝗻𝗼𝗽𝗾𝗿𝘀𝘁𝘂𝘃𝘄𝘅𝘆𝘇𝟬𝟭𝟮𝟯𝟰𝟱𝟲𝟳𝟴𝟵"
-    return text.translate(str.maketrans(normal, bold_chars))
+    return text.translate(_BOLD_TABLE)
+
+# Tables de correspondance construites une seule fois à l'import
+_FLAGS = {
+    "JP": "🇯🇵", "KR": "🇰🇷", "CN": "🇨🇳", "US": "🇺🇸",
+    "FR": "🇫🇷", "GB": "🇬🇧", "DE": "🇩🇪", "ES": "🇪🇸",
+    "IT": "🇮🇹", "CA": "🇨🇦", "AU": "🇦🇺", "IN": "🇮🇳"
+}
+
+_GENRE_EMOJIS = {
+    "Action": "🔫", "Adventure": "🌍", "Fantasy": "⚔", "Drama": "🎭",
+    "Comedy": "😂", "Sci-Fi": "🚀", "Horror": "👻", "Romance": "❤️",
+    "Thriller": "😱", "Mystery": "🔍", "Crime": "🚔", "Animation": "🎨",
+    "Documentary": "📹", "Family": "👨‍👩‍👧", "Music": "🎵", "War": "⚔️",
+    "History": "📜", "Sport": "⚽", "Western": "🤠"
+}
 
 def get_flag(country: str) -> str:
     """Retourne le drapeau correspondant au pays."""
-    flags = {
-        "JP": "🇯🇵", "KR": "🇰🇷", "CN": "🇨🇳", "US": "🇺🇸",
-        "FR": "🇫🇷", "GB": "🇬🇧", "DE": "🇩🇪", "ES": "🇪🇸",
-        "IT": "🇮🇹", "CA": "🇨🇦", "AU": "🇦🇺", "IN": "🇮🇳"
-    }
-    return flags.get(country, "🌐")
+    return _FLAGS.get(country, "🌐")
 
 def get_genre_emoji(genre: str) -> str:
     """Retourne l'emoji correspondant au genre."""
-    emojis = {
-        "Action": "🔫", "Adventure": "🌍", "Fantasy": "⚔", "Drama": "🎭",
-        "Comedy": "😂", "Sci-Fi": "🚀", "Horror": "👻", "Romance": "❤️",
-        "Thriller": "😱", "Mystery": "🔍", "Crime": "🚔", "Animation": "🎨",
-        "Documentary": "📹", "Family": "👨‍👩‍👧", "Music": "🎵", "War": "⚔️",
-        "History": "📜", "Sport": "⚽", "Western": "🤠"
-    }
-    return emojis.get(genre, "🎬")
+    return _GENRE_EMOJIS.get(genre, "🎬")
+
+# Aplatie en (lang, mois) -> nom : un seul accès dict, bornes comprises
+_MONTHS = {
+    (lang, i): name
+    for lang, names in {
+        "fr": ("janvier", "février", "mars", "avril", "mai", "juin",
+               "juillet", "août", "septembre", "octobre", "novembre", "décembre"),
+        "en": ("January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November", "December"),
+        "es": ("enero", "febrero", "marzo", "abril", "mayo", "junio",
+               "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre")
+    }.items()
+    for i, name in enumerate(names, start=1)
+}
 
 def month_name(m: int, lang: str = "fr") -> str:
     """Retourne le nom du mois."""
-    months = {
-        "fr": ["", "janvier", "février", "mars", "avril", "mai", "juin",
-               "juillet", "août", "septembre", "octobre", "novembre", "décembre"],
-        "en": ["", "January", "February", "March", "April", "May", "June",
-               "July", "August", "September", "October", "November", "December"],
-        "es": ["", "enero", "febrero", "marzo", "abril", "mayo", "junio",
-               "julio", "agosto", "septiembre", "octubre", "noviembre", "diciembre"]
-    }
-    return months.get(lang, months["fr"])[m] if 1 <= m <= 12 else "?"
+    return _MONTHS.get((lang, m)) or _MONTHS.get(("fr", m), "?")
+
+# Barres de notation précalculées : index = nombre d'étoiles pleines
+_STARS = tuple("★" * n + "☆" * (5 - n) for n in range(6))
 
 def is_owner(user_id: int) -> bool:
     """Vérifie si l'utilisateur est autorisé."""
     return user_id in AUTHORIZED_USER_IDS
 
+# callback_data binaire compact : 13 octets (user_id, type, identifiant)
+# en base64 url-safe, loin de la limite Telegram de 64 octets et décodé
+# d'un seul struct.unpack au lieu de split + int(). Le user_id ouvre le
+# jeton, sur 64 bits (les IDs Telegram dépassent déjà 2^32) : un clic
+# étranger se rejette sur les 8 premiers octets sans déballer le reste.
+KIND_ANIME = 0
+KIND_MOVIE = 1
+_CB_FORMAT = "<QBI"
+
+def pack_cb(kind: int, ident: int, user_id: int) -> str:
+    """Encode (type, identifiant, user_id) en jeton callback_data."""
+    raw = struct.pack(_CB_FORMAT, user_id, kind, ident)
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def cb_bytes(data: str) -> bytes:
+    """Restitue les octets bruts d'un jeton produit par pack_cb."""
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+# Motif de balises HTML précompilé (chemin chaud des descriptions)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Les descriptions AniList n'emploient qu'une poignée de balises connues :
+# une chaîne de str.replace les élimine sans passer par le moteur regex.
+_KNOWN_TAGS = ("<br><br>", "<br>", "<br/>", "<br />",
+               "<i>", "</i>", "<b>", "</b>", "<em>", "</em>")
+
 def sanitize_text(text: str, max_length: int = 480) -> str:
     """Nettoie et tronque le texte."""
-    text = re.sub(r'<[^>]+>', '', html.unescape(text)).strip()
-    return (text[:max_length] + "...") if len(text) > max_length else (text or "")
+    # html.unescape charge une grosse table d'entités : ne le payer que
+    # si le texte contient effectivement un '&'.
+    if '&' in text:
+        text = html.unescape(text)
+    # Les descriptions AniList (asHtml: false) sont le plus souvent sans
+    # balise : éviter la regex dans ce cas.
+    if '<' in text:
+        for tag in _KNOWN_TAGS:
+            text = text.replace(tag, '')
+        # Balise hors de la liste connue : retomber sur le motif générique
+        if '<' in text:
+            text = _TAG_RE.sub('', text)
+    text = text.strip()
+    # Une seule branche d'allocation : la tranche est gratuite quand le
+    # texte est déjà assez court (CPython renvoie la chaîne d'origine).
+    return text[:max_length] + ("..." if len(text) > max_length else "")
 
 # --- API ---
+async def _get_json(url: str, **kwargs) -> Optional[Dict[str, Any]]:
+    """GET + décodage JSON avec gestion d'erreur typée (un seul parse)."""
+    try:
+        r = await http_client.get(url, **kwargs)
+        r.raise_for_status()
+        return orjson.loads(r.content)
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning("❌ Requête échouée (%s): %s", url, e)
+        return None
+
+# Requêtes en vol : N recherches identiques concurrentes partagent un
+# seul appel réseau au lieu d'en lancer N (le cache n'est rempli qu'au
+# retour de la première).
+_inflight: Dict[tuple, "asyncio.Future"] = {}
+
+async def _dedup(cache_key: tuple, fetch) -> Any:
+    """Exécute fetch() en partageant le résultat avec les appels concurrents."""
+    pending = _inflight.get(cache_key)
+    if pending is not None:
+        return await pending
+
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = fut
+    try:
+        result = await fetch()
+    except BaseException as e:
+        fut.set_exception(e)
+        fut.exception()  # consommée : pas d'avertissement si aucun attenteur
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        _inflight.pop(cache_key, None)
+
 async def search_anime(title: str) -> Optional[List[Dict[str, Any]]]:
     """Recherche plusieurs animes."""
-    cache_key = f"anime_search:{title.lower()}"
-    if cache_key in _cache:
-        logger.info(f"Cache hit pour: {title}")
-        return _cache[cache_key]
-
-    query = """
-    query ($search: String) {
-      Page(page: 1, perPage: 5) {
-        media(search: $search, type: ANIME) {
-          id title { romaji english native } format status genres
-          startDate { year month day } endDate { year month day }
-          studios(isMain: true) { nodes { name } } episodes duration
-          popularity averageScore description(asHtml: false)
-          coverImage { large } countryOfOrigin
-        }
-      }
+    # Normaliser une seule fois : la clé de cache et la requête envoyée
+    # à l'API restent cohérentes
+    title = title.strip()
+    cache_key = ("anime_search", " ".join(title.casefold().split()))
+    if cache_key in _search_cache:
+        logger.info("Cache hit pour: %s", title)
+        return _search_cache[cache_key]
+
+    return await _dedup(cache_key, lambda: _fetch_anime_results(title, cache_key))
+
+_ANILIST_URL = "https://graphql.anilist.co"
+
+_ANILIST_QUERY = """
+query ($search: String) {
+  Page(page: 1, perPage: 5) {
+    media(search: $search, type: ANIME) {
+      id title { romaji english native } format status genres
+      startDate { year month day } endDate { year month day }
+      studios(isMain: true) { nodes { name } } episodes duration
+      popularity averageScore description(asHtml: false)
+      coverImage { large } countryOfOrigin
     }
-    """
+  }
+}
+"""
+
+async def _fetch_anime_results(title: str, cache_key: tuple) -> Optional[List[Dict[str, Any]]]:
+    """Appel réseau AniList (sans cache ni déduplication)."""
+    # Corps encodé avec orjson plutôt que json.dumps via json=
+    body = orjson.dumps({"query": _ANILIST_QUERY, "variables": {"search": title}})
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            r = await client.post(
-                "https://graphql.anilist.co",
-                json={"query": query, "variables": {"search": title.strip()}},
-                headers={"Content-Type": "application/json", "Accept": "application/json"}
-            )
-            r.raise_for_status()
-            results = r.json().get("data", {}).get("Page", {}).get("media", [])
-            if results:
-                _cache[cache_key] = results
-                logger.info(f"✅ {len(results)} anime(s) trouvé(s)")
-            return results
-    except Exception as e:
-        logger.error(f"❌ Erreur recherche anime: {e}")
-    return None
+        r = await http_client.post(
+            _ANILIST_URL,
+            content=body,
+            headers={"Content-Type": "application/json"}
+        )
+        r.raise_for_status()
+        data = orjson.loads(r.content)
+    except (httpx.HTTPError, ValueError):
+        logger.exception("❌ Erreur recherche anime")
+        return None
+
+    results = data.get("data", {}).get("Page", {}).get("media", [])
+    if results:
+        _search_cache[cache_key] = results
+        logger.info("✅ %d anime(s) trouvé(s)", len(results))
+    return results
 
 async def search_movie(title: str) -> Optional[List[Dict[str, Any]]]:
     """Recherche plusieurs films."""
     if not TMDB_API_KEY:
         return None
     
-    cache_key = f"movie_search:{title.lower()}"
-    if cache_key in _cache:
-        logger.info(f"Cache hit pour: {title}")
-        return _cache[cache_key]
+    title = title.strip()
+    cache_key = ("movie_search", " ".join(title.casefold().split()))
+    if cache_key in _search_cache:
+        logger.info("Cache hit pour: %s", title)
+        return _search_cache[cache_key]
 
-    try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            search = await client.get(
-                "https://api.themoviedb.org/3/search/movie",
-                params={"api_key": TMDB_API_KEY, "query": title.strip(), "language": "fr-FR"}
-            )
-            search.raise_for_status()
-            results = search.json().get("results", [])[:5]
-            
-            if results:
-                _cache[cache_key] = results
-                logger.info(f"✅ {len(results)} film(s) trouvé(s)")
-            return results
-            
-    except Exception as e:
-        logger.error(f"❌ Erreur recherche film: {e}")
-    return None
+    return await _dedup(cache_key, lambda: _fetch_movie_results(title, cache_key))
+
+async def _fetch_movie_results(title: str, cache_key: tuple) -> Optional[List[Dict[str, Any]]]:
+    """Appel réseau TMDB (sans cache ni déduplication)."""
+    data = await _get_json(
+        "https://api.themoviedb.org/3/search/movie",
+        params={"api_key": TMDB_API_KEY, "query": title, "language": "fr-FR"}
+    )
+    if data is None:
+        return None
+
+    results = data.get("results", [])[:5]
+    if results:
+        _search_cache[cache_key] = results
+        logger.info("✅ %d film(s) trouvé(s)", len(results))
+    return results
 
 async def get_movie_details(movie_id: int) -> Optional[Dict[str, Any]]:
     """Récupère les détails d'un film."""
-    cache_key = f"movie_details:{movie_id}"
-    if cache_key in _cache:
-        return _cache[cache_key]
-    
+    cache_key = ("movie_details", movie_id)
+    if cache_key in _details_cache:
+        return _details_cache[cache_key]
+
+    return await _dedup(cache_key, lambda: _fetch_movie_details(movie_id, cache_key))
+
+async def _fetch_movie_details(movie_id: int, cache_key: tuple) -> Optional[Dict[str, Any]]:
+    """Appel réseau TMDB détails (sans cache ni déduplication)."""
+    data = await _get_json(
+        f"https://api.themoviedb.org/3/movie/{movie_id}",
+        params={"api_key": TMDB_API_KEY, "language": "fr-FR"}
+    )
+    if data is not None:
+        _details_cache[cache_key] = data
+    return data
+
+_TMDB_IMG_BASE = "https://image.tmdb.org/t/p/original"
+
+async def fetch_poster(path: str) -> Optional[bytes]:
+    """Télécharge une affiche TMDB via le client partagé.
+
+    Passer les octets à Telegram plutôt que l'URL évite que son fetch
+    côté serveur expire quand l'image est froide sur le CDN TMDB ;
+    notre pool keep-alive amortit le handshake TLS entre les appels.
+    """
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            details = await client.get(
-                f"https://api.themoviedb.org/3/movie/{movie_id}",
-                params={"api_key": TMDB_API_KEY, "language": "fr-FR"}
-            )
-            details.raise_for_status()
-            data = details.json()
-            _cache[cache_key] = data
-            return data
-    except Exception as e:
-        logger.error(f"❌ Erreur détails film: {e}")
-    return None
+        r = await http_client.get(f"{_TMDB_IMG_BASE}{path}", timeout=3.0)
+        r.raise_for_status()
+        return r.content
+    except httpx.HTTPError as e:
+        logger.warning("❌ Affiche indisponible (%s): %s", path, e)
+        return None
 
 # --- FORMATTAGE ---
+# Encadré décoratif statique du footer, construit une seule fois
+_FOOTER_BOX = """╔═══『 ✦ 』═══╗
+    {footer}
+╚═══『 ✦ 』═══╝"""
+
+# Gabarits par langue construits à l'import : les libellés statiques sont
+# évalués une fois, le formatage par message se réduit à un .format().
+_ANIME_TEMPLATES = {
+    lang: f"""{{flag}} {tr['anime']}: {{main}}
+{{alt_str}}
+
+☾ {tr['format']}: {{fmt}}
+☾ {tr['status']}: {{status}}
+☾ {tr['genres']}: {{genres}}
+
+☾ {tr['year']}: {{year}}
+☾ {tr['start']}: {{start_str}}
+☾ {tr['end']}: {{end_str}}
+☾ {tr['studio']}: {{studio}}
+☾ {tr['episodes']}: {{episodes}}
+☾ {tr['duration']}: {{duration}}
+☾ {tr['popularity']}: {{popularity}}
+☾ {tr['rating']}: {{rating}} ({{score}}/100)
+
+{_FOOTER_BOX}
+
+{tr['summary']}:
+{{desc}}"""
+    for lang, tr in TRANSLATIONS.items()
+}
+
+_MOVIE_TEMPLATES = {
+    lang: f"""🇺🇸 {tr['film']}: {{title}}
+
+☾ {tr['status']}: {tr['status_released']}
+☾ {tr['genres']}: {{genres}}
+
+☾ {tr['year']}: {{year}}
+☾ {tr['duration']}: {{runtime}}
+☾ {tr['popularity']}: {{popularity}}
+☾ {tr['rating']}: {{rating}} ({{vote}}/10)
+
+{_FOOTER_BOX}
+
+{tr['summary']}:
+{{desc}}"""
+    for lang, tr in TRANSLATIONS.items()
+}
+
 def format_anime(data: Dict[str, Any], lang: str, footer: str) -> str:
     """Formate les données d'un anime."""
-    flag = get_flag(data.get("countryOfOrigin", "JP"))
+    # Lier data.get en local : ~20 accès dict dans ce formateur
+    get = data.get
+    flag = get_flag(get("countryOfOrigin", "JP"))
     titles = data["title"]
     main = titles.get("romaji") or titles.get("english") or "???"
     alts = list(dict.fromkeys(filter(None, [titles.get("english"), titles.get("native")])))
     alt_str = " / ".join(alts[:2]) if alts else ""
 
-    fmt = data.get("format", "?").replace("_", " ").title()
+    # Résoudre la table de langue une seule fois pour tout le formatage
+    tr = TRANSLATIONS.get(lang) or TRANSLATIONS["fr"]
+
+    fmt = get("format", "?").replace("_", " ").title()
+    raw_status = get("status", "?")
     status_map = {
-        "FINISHED": t("status_finished", lang),
-        "RELEASING": t("status_releasing", lang),
-        "NOT_YET_RELEASED": t("status_upcoming", lang),
-        "CANCELLED": t("status_cancelled", lang)
+        "FINISHED": tr["status_finished"],
+        "RELEASING": tr["status_releasing"],
+        "NOT_YET_RELEASED": tr["status_upcoming"],
+        "CANCELLED": tr["status_cancelled"]
     }
-    status = status_map.get(data.get("status", "?"), data.get("status", "?"))
-    genres = " / ".join(f"{get_genre_emoji(g)} {g}" for g in data.get("genres", [])[:4]) or "?"
-
-    start = data.get("startDate", {})
-    end = data.get("endDate", {})
-    start_str = f"{start.get('day', '?')} {month_name(start.get('month') or 0, lang)} {start.get('year', '?')}" if start.get('year') else "?"
-    end_str = f"{end.get('day', '?')} {month_name(end.get('month') or 0, lang)} {end.get('year', '?')}" if end.get('year') else "?"
-
-    studio = data["studios"]["nodes"][0]["name"] if data.get("studios", {}).get("nodes") else "?"
-    episodes = data.get("episodes", "?")
-    duration = f"{data.get('duration', '?')} min/ép"
-    popularity = f"#{data.get('popularity', '?')}"
-    score = data.get("averageScore")
-    rating = "★" * (score // 20) + "☆" * (5 - score // 20) if score else "?"
-
-    desc = sanitize_text(data.get("description", "")) or t("no_description", lang)
-
-    return f"""{flag} {bold(t('anime', lang))}: {main}
-{alt_str}
-
-☾ {bold(t('format', lang))}: {fmt}
-☾ {bold(t('status', lang))}: {status}
-☾ {bold(t('genres', lang))}: {genres}
-
-☾ {bold(t('year', lang))}: {start.get('year', '?')}
-☾ {bold(t('start', lang))}: {start_str}
-☾ {bold(t('end', lang))}: {end_str}
-☾ {bold(t('studio', lang))}: {studio}
-☾ {bold(t('episodes', lang))}: {episodes}
-☾ {bold(t('duration', lang))}: {duration}
-☾ {bold(t('popularity', lang))}: {popularity}
-☾ {bold(t('rating', lang))}: {rating} ({score}/100)
-
-╔═══『 ✦ 』═══╗
-    {footer}
-╚═══『 ✦ 』═══╝
+    status = status_map.get(raw_status, raw_status)
+    # LOAD_FAST dans la boucle des genres plutôt qu'un lookup global par itération
+    _emoji = _GENRE_EMOJIS.get
+    genres = " / ".join(f"{_emoji(g, '🎬')} {g}" for g in get("genres", [])[:4]) or "?"
+
+    start = get("startDate") or {}
+    end = get("endDate") or {}
+    start_year = start.get("year")
+    end_year = end.get("year")
+    start_str = f"{start.get('day', '?')} {month_name(start.get('month') or 0, lang)} {start_year}" if start_year else "?"
+    end_str = f"{end.get('day', '?')} {month_name(end.get('month') or 0, lang)} {end_year}" if end_year else "?"
 
-{bold(t('summary', lang))}:
-{desc}"""
+    # EAFP : une seule traversée de la chaîne studios/nodes/name
+    try:
+        studio = data["studios"]["nodes"][0]["name"]
+    except (KeyError, IndexError, TypeError):
+        studio = "?"
+    episodes = get("episodes", "?")
+    duration = f"{get('duration', '?')} min/ép"
+    popularity = f"#{get('popularity', '?')}"
+    score = get("averageScore")
+    rating = _STARS[min(5, score // 20)] if score else "?"
+
+    desc = sanitize_text(get("description", "")) or tr["no_description"]
+
+    template = _ANIME_TEMPLATES.get(lang) or _ANIME_TEMPLATES["fr"]
+    return template.format(
+        flag=flag, main=main, alt_str=alt_str, fmt=fmt, status=status,
+        genres=genres, year=start_year or '?', start_str=start_str,
+        end_str=end_str, studio=studio, episodes=episodes, duration=duration,
+        popularity=popularity, rating=rating, score=score, footer=footer,
+        desc=desc
+    )
 
 def format_movie(data: Dict[str, Any], lang: str, footer: str) -> str:
     """Formate les données d'un film."""
-    release = data.get("release_date", "")
+    get = data.get
+    release = get("release_date", "")
     year = release[:4] if release else "?"
-    genres = " / ".join(f"{get_genre_emoji(g['name'])} {g['name']}" for g in data.get("genres", [])[:4]) or "?"
-    runtime = f"{data.get('runtime', '?')} min" if data.get("runtime") else "?"
-    popularity = f"#{int(data.get('popularity', 0))}" if data.get("popularity") else "?"
-    vote = data.get("vote_average", 0)
-    rating = "★" * int(vote // 2) + "☆" * (5 - int(vote // 2)) if vote >= 1 else "?"
+    _emoji = _GENRE_EMOJIS.get
+    genres = " / ".join(f"{_emoji(g['name'], '🎬')} {g['name']}" for g in get("genres", [])[:4]) or "?"
+    runtime_min = get("runtime")
+    runtime = f"{runtime_min} min" if runtime_min else "?"
+    pop = get("popularity")
+    popularity = f"#{int(pop)}" if pop else "?"
+    vote = get("vote_average", 0)
+    rating = _STARS[min(5, int(vote // 2))] if vote >= 1 else "?"
 
-    desc = sanitize_text(data.get("overview", "")) or t("no_description", lang)
+    desc = sanitize_text(get("overview", "")) or t("no_description", lang)
 
-    return f"""🇺🇸 {bold(t('film', lang))}: {data.get('title', '???')}
+    template = _MOVIE_TEMPLATES.get(lang) or _MOVIE_TEMPLATES["fr"]
+    return template.format(
+        title=get('title', '???'), genres=genres, year=year, runtime=runtime,
+        popularity=popularity, rating=rating, vote=vote, footer=footer,
+        desc=desc
+    )
 
-☾ {bold(t('status', lang))}: {t('status_released', lang)}
-☾ {bold(t('genres', lang))}: {genres}
+# Limites Telegram : garantir que le premier envoi passe toujours au
+# lieu de provoquer un 400 + nouvel aller-retour
+_TG_TEXT_MAX = 4096
+_TG_CAPTION_MAX = 1024
 
-☾ {bold(t('year', lang))}: {year}
-☾ {bold(t('duration', lang))}: {runtime}
-☾ {bold(t('popularity', lang))}: {popularity}
-☾ {bold(t('rating', lang))}: {rating} ({vote}/10)
+# Au-delà de ce seuil de description, le formatage (unescape, regex,
+# .format) part dans l'executor pour ne pas bloquer la boucle pendant
+# que d'autres mises à jour attendent.
+_FORMAT_THREAD_THRESHOLD = 2048
 
-╔═══『 ✦ 』═══╗
-    {footer}
-╚═══『 ✦ 』═══╝
+def _truncate_message(text: str) -> str:
+    """Tronque au plafond Telegram des messages texte."""
+    return text[:_TG_TEXT_MAX - 1] + "…" if len(text) > _TG_TEXT_MAX else text
 
-{bold(t('summary', lang))}:
-{desc}"""
+async def render_anime(data: Dict[str, Any], lang: str, footer: str) -> str:
+    """Formate un anime, hors boucle d'événements pour les gros payloads."""
+    if len(data.get("description") or "") > _FORMAT_THREAD_THRESHOLD:
+        formatted = await asyncio.to_thread(format_anime, data, lang, footer)
+    else:
+        formatted = format_anime(data, lang, footer)
+    return _truncate_message(formatted)
+
+async def render_movie(data: Dict[str, Any], lang: str, footer: str) -> str:
+    """Formate un film, hors boucle d'événements pour les gros payloads."""
+    if len(data.get("overview") or "") > _FORMAT_THREAD_THRESHOLD:
+        formatted = await asyncio.to_thread(format_movie, data, lang, footer)
+    else:
+        formatted = format_movie(data, lang, footer)
+    return _truncate_message(formatted)
 
 # --- COMMANDES ---
+# Messages /start et /stats : les parties statiques par langue sont
+# évaluées à l'import, seuls les champs dynamiques restent à injecter.
+_WELCOME_TEMPLATES = {
+    lang: f"""{tr['welcome']} !
+
+{tr['commands_available']}
+/anime <titre> - {tr['search_anime']}
+/movie <titre> - {tr['search_movie']}
+/setfooter <texte> - {tr['change_footer']}
+/setlang <fr|en|es> - {tr['change_language']}
+/stats - {tr['show_stats']}
+/clearcache - {tr['clear_cache']}
+/help - {tr['show_help']}
+
+{tr['bot_by']} {{footer}}"""
+    for lang, tr in TRANSLATIONS.items()
+}
+
+_STATS_TEMPLATES = {
+    lang: f"""{tr['stats']}
+
+• {tr['cache']}: {{cache_entries}} {tr['entries']}
+• {tr['users_authorized']}: {{users}}
+• {tr['environment']}: {{environment}}
+• TMDB: {{tmdb}}
+• Total recherches: {{searches}}
+
+{tr['time']}: {{time}}"""
+    for lang, tr in TRANSLATIONS.items()
+}
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Commande /start."""
     if not is_owner(update.effective_user.id):
         await update.message.reply_text(t("access_denied"))
-        logger.warning(f"❌ Accès refusé - User ID: {update.effective_user.id}")
+        logger.warning("❌ Accès refusé - User ID: %s", update.effective_user.id)
         return
     
     settings = await get_user_settings(update.effective_user.id)
     lang = settings["language"]
     footer = settings["footer"]
     
-    welcome = f"""{t('welcome', lang)} !
-
-{t('commands_available', lang)}
-/anime <titre> - {t('search_anime', lang)}
-/movie <titre> - {t('search_movie', lang)}
-/setfooter <texte> - {t('change_footer', lang)}
-/setlang <fr|en|es> - {t('change_language', lang)}
-/stats - {t('show_stats', lang)}
-/clearcache - {t('clear_cache', lang)}
-/help - {t('show_help', lang)}
-
-{t('bot_by', lang)} {footer}"""
-    
-    await update.message.reply_text(welcome)
-    logger.info(f"✅ /start - User: {update.effective_user.username or update.effective_user.id}")
+    template = _WELCOME_TEMPLATES.get(lang) or _WELCOME_TEMPLATES["fr"]
+    await update.message.reply_text(template.format(footer=footer))
+    logger.info("✅ /start - User: %s", update.effective_user.username or update.effective_user.id)
 
 async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Commande /help."""
@@ -591,16 +929,16 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     global_stats = await get_global_stats()
     
-    stats_text = f"""{t('stats', lang)}
-
-• {t('cache', lang)}: {len(_cache)} {t('entries', lang)}
-• {t('users_authorized', lang)}: {len(AUTHORIZED_USER_IDS)}
-• {t('environment', lang)}: {ENVIRONMENT}
-• TMDB: {t('configured', lang) if TMDB_API_KEY else t('not_configured', lang)}
-• Total recherches: {global_stats.get('total_searches', 0)}
+    template = _STATS_TEMPLATES.get(lang) or _STATS_TEMPLATES["fr"]
+    stats_text = template.format(
+        cache_entries=len(_search_cache) + len(_details_cache),
+        users=len(AUTHORIZED_USER_IDS),
+        environment=ENVIRONMENT,
+        tmdb=t('configured', lang) if TMDB_API_KEY else t('not_configured', lang),
+        searches=global_stats.get('total_searches', 0),
+        time=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    )
 
-{t('time', lang)}: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"""
-    
     await update.message.reply_text(stats_text)
 
 async def clear_cache(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -611,11 +949,11 @@ async def clear_cache(update: Update, context: ContextTypes.DEFAULT_TYPE):
     settings = await get_user_settings(update.effective_user.id)
     lang = settings["language"]
     
-    global _cache
-    count = len(_cache)
-    _cache.clear()
+    count = len(_search_cache) + len(_details_cache)
+    _search_cache.clear()
+    _details_cache.clear()
     await update.message.reply_text(t("cache_cleared", lang, count=count))
-    logger.info(f"Cache cleared by {update.effective_user.id}")
+    logger.info("Cache cleared by %s", update.effective_user.id)
 
 async def set_footer(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Commande /setfooter - Change le footer de l'utilisateur."""
@@ -634,7 +972,7 @@ async def set_footer(update: Update, context: ContextTypes.DEFAULT_TYPE):
     new_footer = " ".join(context.args)
     await update_user_footer(update.effective_user.id, new_footer)
     await update.message.reply_text(f"{t('footer_updated', lang)}\n{new_footer}")
-    logger.info(f"Footer changed by {update.effective_user.id} to: {new_footer}")
+    logger.info("Footer changed by %s to: %s", update.effective_user.id, new_footer)
 
 async def set_language(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Commande /setlang - Change la langue de l'utilisateur."""
@@ -658,233 +996,314 @@ async def set_language(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await update.message.reply_text(
         f"{t('language_updated', new_lang)} {lang_names[new_lang]}"
     )
-    logger.info(f"Language changed by {update.effective_user.id} to: {new_lang}")
+    logger.info("Language changed by %s to: %s", update.effective_user.id, new_lang)
 
 async def anime_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Commande /anime - Recherche un anime avec sélection."""
     if not is_owner(update.effective_user.id):
         return
     
-    settings = await get_user_settings(update.effective_user.id)
+    settings = await get_settings_and_increment(update.effective_user.id)
     lang = settings["language"]
-    
-    if not context.args:
+    # Table de langue résolue une fois : plus aucun passage par t()
+    # dans le corps du handler
+    tr = TRANSLATIONS.get(lang) or TRANSLATIONS["fr"]
+
+    # Ignorer les requêtes vides ou d'un seul caractère : elles ne
+    # donnent jamais de résultat utile et coûtent un appel API.
+    title = " ".join(context.args).strip() if context.args else ""
+    if len(title) < 2:
         await update.message.reply_text(
-            f"{t('usage', lang)} /anime <titre>\n\n{t('example', lang)} /anime Naruto"
+            f"{tr['usage']} /anime <titre>\n\n{tr['example']} /anime Naruto"
         )
         return
-    
-    title = " ".join(context.args)
-    msg = await update.message.reply_text(f"{t('searching', lang)} {title}...")
-    
+
+    # Lancer la recherche en parallèle du message d'attente
+    msg, results = await asyncio.gather(
+        update.message.reply_text(f"{tr['searching']} {title}..."),
+        search_anime(title)
+    )
+
     try:
-        results = await search_anime(title)
         if not results:
-            await msg.edit_text(t("no_results", lang))
+            await msg.edit_text(tr["no_results"])
             return
         
-        await increment_stat("total_searches")
-        
         # Si un seul résultat, l'afficher directement
         if len(results) == 1:
-            formatted = format_anime(results[0], lang, settings["footer"])
+            formatted = await render_anime(results[0], lang, settings["footer"])
             img = results[0].get("coverImage", {}).get("large")
-            
-            if img and len(formatted) <= 1024:
-                await update.message.reply_photo(img, caption=formatted)
-                await msg.delete()
+
+            if img and len(formatted) <= _TG_CAPTION_MAX:
+                # L'envoi de la photo et la suppression du message
+                # d'attente ne dépendent pas l'un de l'autre
+                await asyncio.gather(
+                    update.message.reply_photo(img, caption=formatted),
+                    msg.delete()
+                )
+            elif img:
+                # Légende trop longue : un seul message avec l'image en
+                # aperçu de lien plutôt que photo + texte séparés
+                await msg.edit_text(
+                    formatted,
+                    link_preview_options=LinkPreviewOptions(
+                        url=img, prefer_large_media=True, show_above_text=True
+                    )
+                )
             else:
-                if img:
-                    await update.message.reply_photo(img)
                 await msg.edit_text(formatted)
             return
         
-        # Créer les boutons de sélection
+        # Boutons et lignes du récapitulatif en une seule passe :
+        # le titre n'est résolu qu'une fois par résultat
+        user_id = update.effective_user.id
         keyboard = []
-        for i, result in enumerate(results):
-            titles = result["title"]
-            main = titles.get("romaji") or titles.get("english") or "???"
-            year = result.get("startDate", {}).get("year", "?")
-            button_text = f"{main} ({year})"[:60]
+        lines = []
+        for i, r in enumerate(results):
+            titles = r["title"]
+            name = titles.get("romaji") or titles.get("english") or "???"
             keyboard.append([InlineKeyboardButton(
-                button_text, 
-                callback_data=f"anime_{i}_{update.effective_user.id}"
+                f"{name} ({r.get('startDate', {}).get('year', '?')})"[:60],
+                callback_data=pack_cb(KIND_ANIME, i, user_id)
             )])
-        
+            lines.append(f"{i + 1}. {name}")
         reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        # Stocker les résultats temporairement
-        context.user_data[f"anime_results_{update.effective_user.id}"] = {
+
+        # Stocker les résultats en attendant le clic
+        PENDING[(user_id, "anime")] = {
             "results": results,
             "settings": settings
         }
-        
+
         await msg.edit_text(
-            f"{t('select_result', lang)}\n\n" + 
-            "\n".join([f"{i+1}. {r['title'].get('romaji', '???')}" for i, r in enumerate(results)]),
+            f"{tr['select_result']}\n\n" + "\n".join(lines),
             reply_markup=reply_markup
         )
-        
+
     except TelegramError as e:
-        logger.error(f"Telegram error: {e}")
-        await msg.edit_text(t("error_sending", lang))
-    except Exception as e:
-        logger.error(f"Unexpected error in anime command: {e}")
-        await msg.edit_text(t("error_unexpected", lang))
+        logger.error("Telegram error: %s", e)
+        await msg.edit_text(tr["error_sending"])
+    except Exception:
+        logger.exception("Unexpected error in anime command")
+        await msg.edit_text(tr["error_unexpected"])
 
 async def movie_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Commande /movie - Recherche un film avec sélection."""
     if not is_owner(update.effective_user.id):
         return
     
-    settings = await get_user_settings(update.effective_user.id)
+    settings = await get_settings_and_increment(update.effective_user.id)
     lang = settings["language"]
-    
-    if not context.args:
+    # Table de langue résolue une fois : plus aucun passage par t()
+    # dans le corps du handler
+    tr = TRANSLATIONS.get(lang) or TRANSLATIONS["fr"]
+
+    title = " ".join(context.args).strip() if context.args else ""
+    if len(title) < 2:
         await update.message.reply_text(
-            f"{t('usage', lang)} /movie <titre>\n\n{t('example', lang)} /movie Inception"
+            f"{tr['usage']} /movie <titre>\n\n{tr['example']} /movie Inception"
         )
         return
-    
+
     if not TMDB_API_KEY:
-        await update.message.reply_text(t("tmdb_not_configured", lang))
+        await update.message.reply_text(tr["tmdb_not_configured"])
         return
-    
-    title = " ".join(context.args)
-    msg = await update.message.reply_text(f"{t('searching', lang)} {title}...")
-    
+
+    # Lancer la recherche en parallèle du message d'attente
+    msg, results = await asyncio.gather(
+        update.message.reply_text(f"{tr['searching']} {title}..."),
+        search_movie(title)
+    )
+
     try:
-        results = await search_movie(title)
         if not results:
-            await msg.edit_text(t("no_results", lang))
+            await msg.edit_text(tr["no_results"])
             return
         
-        await increment_stat("total_searches")
-        
-        # Si un seul résultat, l'afficher directement
+        # Si un seul résultat, l'afficher directement. La recherche TMDB
+        # contient déjà presque tout (titre, date, synopsis, affiche) :
+        # si les détails échouent, on formate le résultat de recherche
+        # plutôt que de ne rien répondre (runtime/genres affichés "?").
         if len(results) == 1:
-            details = await get_movie_details(results[0]["id"])
-            if details:
-                formatted = format_movie(details, lang, settings["footer"])
-                poster = details.get("poster_path")
-                img = f"https://image.tmdb.org/t/p/original{poster}" if poster else None
-                
-                if img and len(formatted) <= 1024:
-                    await update.message.reply_photo(img, caption=formatted)
-                    await msg.delete()
-                else:
-                    if img:
-                        await update.message.reply_photo(img)
-                    await msg.edit_text(formatted)
+            details = await get_movie_details(results[0]["id"]) or results[0]
+            formatted = await render_movie(details, lang, settings["footer"])
+            poster = details.get("poster_path")
+            img = f"{_TMDB_IMG_BASE}{poster}" if poster else None
+
+            if img and len(formatted) <= _TG_CAPTION_MAX:
+                await asyncio.gather(
+                    update.message.reply_photo(img, caption=formatted),
+                    msg.delete()
+                )
+            elif img:
+                await msg.edit_text(
+                    formatted,
+                    link_preview_options=LinkPreviewOptions(
+                        url=img, prefer_large_media=True, show_above_text=True
+                    )
+                )
+            else:
+                await msg.edit_text(formatted)
             return
         
         # Créer les boutons de sélection
+        user_id = update.effective_user.id
+        # Boutons et lignes du récapitulatif en une seule passe :
+        # le titre n'est résolu qu'une fois par résultat
         keyboard = []
-        for i, result in enumerate(results):
-            title_text = result.get("title", "???")
-            year = result.get("release_date", "")[:4] if result.get("release_date") else "?"
-            button_text = f"{title_text} ({year})"[:60]
+        lines = []
+        for i, r in enumerate(results):
+            name = r.get("title", "???")
             keyboard.append([InlineKeyboardButton(
-                button_text, 
-                callback_data=f"movie_{result['id']}_{update.effective_user.id}"
+                f"{name} ({r.get('release_date', '')[:4] or '?'})"[:60],
+                callback_data=pack_cb(KIND_MOVIE, r["id"], user_id)
             )])
-        
+            lines.append(f"{i + 1}. {name}")
         reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        # Stocker les settings temporairement
-        context.user_data[f"movie_settings_{update.effective_user.id}"] = settings
+
+        # Précharger les détails pendant que l'utilisateur choisit : le
+        # callback attendra une tâche déjà lancée (ou déjà finie) au
+        # lieu de payer l'aller-retour TMDB à froid.
+        detail_tasks = {
+            r["id"]: asyncio.create_task(get_movie_details(r["id"]))
+            for r in results
+        }
+
+        # Stocker les settings et les préchargements en attendant le clic
+        PENDING[(user_id, "movie")] = {
+            "settings": settings,
+            "details": detail_tasks
+        }
         
         await msg.edit_text(
-            f"{t('select_result', lang)}\n\n" + 
-            "\n".join([f"{i+1}. {r.get('title', '???')}" for i, r in enumerate(results)]),
+            f"{tr['select_result']}\n\n" + "\n".join(lines),
             reply_markup=reply_markup
         )
-        
+
     except TelegramError as e:
-        logger.error(f"Telegram error: {e}")
-        await msg.edit_text(t("error_sending", lang))
-    except Exception as e:
-        logger.error(f"Unexpected error in movie command: {e}")
-        await msg.edit_text(t("error_unexpected", lang))
+        logger.error("Telegram error: %s", e)
+        await msg.edit_text(tr["error_sending"])
+    except Exception:
+        logger.exception("Unexpected error in movie command")
+        await msg.edit_text(tr["error_unexpected"])
+
+async def _reply_photo_and_delete(query, img, formatted: str):
+    """Envoie la photo légendée et supprime le menu en parallèle.
+
+    L'ordre des deux appels est indifférent pour l'utilisateur. Une
+    suppression ratée est bénigne (la liste reste affichée) ; si c'est
+    l'envoi de la photo qui échoue, on renvoie au moins le texte.
+    """
+    sent, _ = await asyncio.gather(
+        query.message.reply_photo(img, caption=formatted),
+        query.delete_message(),
+        return_exceptions=True
+    )
+    if isinstance(sent, Exception):
+        logger.error("Échec de l'envoi de la photo: %s", sent)
+        await query.message.reply_text(formatted)
+
+async def _reply_photo_and_edit(query, img, formatted: str):
+    """Envoie la photo et édite le texte en parallèle.
+
+    Les deux appels visent des messages indépendants : les sérialiser
+    doublait la latence perçue du chemin « légende trop longue ».
+    """
+    results = await asyncio.gather(
+        query.message.reply_photo(img),
+        query.edit_message_text(formatted),
+        return_exceptions=True
+    )
+    for res in results:
+        if isinstance(res, Exception):
+            logger.error("Envoi partiel dans le callback: %s", res)
 
 async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Gère les callbacks des boutons inline."""
     query = update.callback_query
-    await query.answer()
-    
-    data_parts = query.data.split("_")
-    media_type = data_parts[0]
-    user_id = int(data_parts[-1])
-    
-    # Vérifier que c'est bien l'utilisateur qui a fait la recherche
-    if query.from_user.id != user_id:
+    # answerCallbackQuery ne sert qu'à stopper le spinner : le lancer en
+    # tâche de fond évite de payer un aller-retour avant le vrai travail
+    asyncio.create_task(query.answer())
+
+    raw = cb_bytes(query.data)
+
+    # Vérifier que c'est bien l'utilisateur qui a fait la recherche :
+    # comparaison sur les 8 premiers octets, sans déballage complet
+    if int.from_bytes(raw[:8], "little") != query.from_user.id:
         return
-    
+
+    user_id, kind, ident = struct.unpack(_CB_FORMAT, raw)
+
     try:
-        if media_type == "anime":
-            index = int(data_parts[1])
-            cache_key = f"anime_results_{user_id}"
-            
-            if cache_key not in context.user_data:
+        if kind == KIND_ANIME:
+            index = ident
+
+            data = PENDING.pop((user_id, "anime"), None)
+            if data is None:
                 await query.edit_message_text("❌ Session expirée. Relancez la recherche.")
                 return
-            
-            data = context.user_data[cache_key]
+
             result = data["results"][index]
             settings = data["settings"]
             
-            formatted = format_anime(result, settings["language"], settings["footer"])
+            formatted = await render_anime(result, settings["language"], settings["footer"])
             img = result.get("coverImage", {}).get("large")
             
-            if img and len(formatted) <= 1024:
-                await query.message.reply_photo(img, caption=formatted)
-                await query.delete_message()
+            if img and len(formatted) <= _TG_CAPTION_MAX:
+                await _reply_photo_and_delete(query, img, formatted)
+            elif img:
+                await _reply_photo_and_edit(query, img, formatted)
             else:
-                if img:
-                    await query.message.reply_photo(img)
                 await query.edit_message_text(formatted)
-            
-            # Nettoyer
-            del context.user_data[cache_key]
-            
-        elif media_type == "movie":
-            movie_id = int(data_parts[1])
-            settings_key = f"movie_settings_{user_id}"
-            
-            if settings_key not in context.user_data:
+
+        elif kind == KIND_MOVIE:
+            movie_id = ident
+
+            data = PENDING.pop((user_id, "movie"), None)
+            if data is None:
                 await query.edit_message_text("❌ Session expirée. Relancez la recherche.")
                 return
-            
-            settings = context.user_data[settings_key]
-            
-            details = await get_movie_details(movie_id)
+
+            settings = data["settings"]
+
+            # Réutiliser le préchargement lancé par movie_command
+            task = data["details"].get(movie_id)
+            details = await task if task is not None else await get_movie_details(movie_id)
             if not details:
                 await query.edit_message_text("❌ Erreur lors de la récupération des détails.")
                 return
             
-            formatted = format_movie(details, settings["language"], settings["footer"])
+            formatted = await render_movie(details, settings["language"], settings["footer"])
             poster = details.get("poster_path")
-            img = f"https://image.tmdb.org/t/p/original{poster}" if poster else None
+            # Octets prêts à l'envoi si le CDN répond vite, sinon l'URL
+            # (Telegram fera le fetch lui-même)
+            img = None
+            if poster:
+                img = await fetch_poster(poster) or f"{_TMDB_IMG_BASE}{poster}"
             
-            if img and len(formatted) <= 1024:
-                await query.message.reply_photo(img, caption=formatted)
-                await query.delete_message()
+            if img and len(formatted) <= _TG_CAPTION_MAX:
+                await _reply_photo_and_delete(query, img, formatted)
+            elif img:
+                await _reply_photo_and_edit(query, img, formatted)
             else:
-                if img:
-                    await query.message.reply_photo(img)
                 await query.edit_message_text(formatted)
-            
-            # Nettoyer
-            del context.user_data[settings_key]
-            
-    except Exception as e:
-        logger.error(f"Error in button callback: {e}")
+
+    except Exception:
+        logger.exception("Error in button callback")
         await query.edit_message_text("❌ Erreur inattendue.")
 
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Gère les erreurs globales."""
-    logger.error(f"Update {update} caused error {context.error}")
-    
+    # repr() d'un Update complet parcourt tout l'objet (clavier inline,
+    # textes...) : réserver ce coût au niveau DEBUG
+    logger.error(
+        "Update %s caused error %s",
+        getattr(update, "update_id", "?"), context.error
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Full update: %r", update)
+
+
     if update and update.effective_message:
         try:
             await update.effective_message.reply_text(
@@ -893,13 +1312,10 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         except Exception:
             pass
 
-async def post_init(application: Application):
-    """Initialisation post-startup."""
-    # Initialiser la base de données
-    await init_db()
-    
-    # Définir les commandes du bot
-    commands = [
+# Listes de commandes par langue : le français reste la liste par défaut
+# (sans language_code), les autres sont des localisations Telegram.
+_COMMANDS_BY_LANG = {
+    "fr": [
         BotCommand("start", "Démarrer le bot"),
         BotCommand("anime", "Rechercher un anime"),
         BotCommand("movie", "Rechercher un film"),
@@ -908,51 +1324,165 @@ async def post_init(application: Application):
         BotCommand("stats", "Voir les statistiques"),
         BotCommand("clearcache", "Vider le cache"),
         BotCommand("help", "Aide"),
-    ]
-    await application.bot.set_my_commands(commands)
+    ],
+    "en": [
+        BotCommand("start", "Start the bot"),
+        BotCommand("anime", "Search for an anime"),
+        BotCommand("movie", "Search for a movie"),
+        BotCommand("setfooter", "Change the footer"),
+        BotCommand("setlang", "Change the language"),
+        BotCommand("stats", "Show statistics"),
+        BotCommand("clearcache", "Clear the cache"),
+        BotCommand("help", "Help"),
+    ],
+    "es": [
+        BotCommand("start", "Iniciar el bot"),
+        BotCommand("anime", "Buscar un anime"),
+        BotCommand("movie", "Buscar una película"),
+        BotCommand("setfooter", "Cambiar el footer"),
+        BotCommand("setlang", "Cambiar el idioma"),
+        BotCommand("stats", "Ver las estadísticas"),
+        BotCommand("clearcache", "Vaciar la caché"),
+        BotCommand("help", "Ayuda"),
+    ],
+}
+
+async def post_init(application: Application):
+    """Initialisation post-startup."""
+    # Initialiser le client HTTP partagé et la base de données
+    await init_http_client()
+    await init_db()
+
+    # Tous les setMyCommands partent en parallèle : le démarrage coûte
+    # un seul RTT quel que soit le nombre de langues
+    await asyncio.gather(
+        application.bot.set_my_commands(_COMMANDS_BY_LANG["fr"]),
+        *[
+            application.bot.set_my_commands(cmds, language_code=lc)
+            for lc, cmds in _COMMANDS_BY_LANG.items()
+        ]
+    )
     logger.info("✅ Commandes du bot configurées")
 
 async def post_shutdown(application: Application):
     """Nettoyage à l'arrêt."""
+    if http_client:
+        await http_client.aclose()
+        logger.info("✅ Client HTTP fermé")
+    if _stats_flush_task:
+        _stats_flush_task.cancel()
     if db_pool:
+        # Ne pas perdre les compteurs de la dernière fenêtre
+        await _flush_pending_stats()
         await db_pool.close()
         logger.info("✅ Pool PostgreSQL fermé")
 
 # --- LANCEMENT ---
+def _run_webhook_asgi(app: Application):
+    """Sert le webhook via Starlette/uvicorn en alimentant update_queue.
+
+    Contrairement au serveur intégré de run_webhook, un process uvicorn
+    se réplique derrière un load balancer et mutualise le keep-alive
+    HTTP ; PTB ne fait plus que consommer la file d'updates.
+    """
+    import contextlib
+
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.responses import Response
+    from starlette.routing import Route
+
+    async def webhook(request) -> Response:
+        update = Update.de_json(orjson.loads(await request.body()), app.bot)
+        await app.update_queue.put(update)
+        return Response()
+
+    @contextlib.asynccontextmanager
+    async def lifespan(_):
+        await app.initialize()
+        # run_webhook invoquerait post_init/post_shutdown pour nous ;
+        # ici le serveur HTTP est le nôtre, donc on les appelle à la main.
+        await post_init(app)
+        await app.bot.set_webhook(
+            url=f"{WEBHOOK_URL}/webhook", allowed_updates=Update.ALL_TYPES
+        )
+        await app.start()
+        try:
+            yield
+        finally:
+            await app.stop()
+            await app.shutdown()
+            await post_shutdown(app)
+
+    asgi = Starlette(
+        routes=[Route("/webhook", webhook, methods=["POST"])],
+        lifespan=lifespan
+    )
+    uvicorn.run(asgi, host="0.0.0.0", port=PORT)
+
 def main():
     """Point d'entrée principal."""
     logger.info("🚀 Démarrage du bot...")
+
+    run_as_webhook = ENVIRONMENT == "production" and WEBHOOK_URL
+
+    # Construction de l'application. Le rate limiter file les appels
+    # sortants sous les plafonds Telegram (~30 msg/s globaux, 20/min par
+    # groupe) au lieu de laisser chaque envoi encaisser un RetryAfter.
+    builder = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        # Jusqu'à 256 updates traités de front : sans cela le processeur
+        # d'updates sérialise tout en amont des handlers
+        .concurrent_updates(256)
+        .rate_limiter(AIORateLimiter(
+            overall_max_rate=28, overall_time_period=1,
+            group_max_rate=18, group_time_period=60,
+            max_retries=3
+        ))
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
+    )
+    if run_as_webhook:
+        # Pas d'Updater : les updates arrivent par l'endpoint ASGI
+        builder = builder.updater(None)
+    app = builder.build()
     
-    # Construction de l'application
-    app = Application.builder().token(BOT_TOKEN).post_init(post_init).post_shutdown(post_shutdown).build()
-    
-    # Handlers
-    app.add_handler(CommandHandler("start", start))
-    app.add_handler(CommandHandler("help", help_command))
-    app.add_handler(CommandHandler("stats", stats_command))
-    app.add_handler(CommandHandler("clearcache", clear_cache))
-    app.add_handler(CommandHandler("setfooter", set_footer))
-    app.add_handler(CommandHandler("setlang", set_language))
-    app.add_handler(CommandHandler("anime", anime_command))
-    app.add_handler(CommandHandler("movie", movie_command))
-    app.add_handler(CallbackQueryHandler(button_callback))
+    # Handlers, enregistrés en un seul appel. block=False sur les
+    # chemins dominés par les I/O AniList/TMDB : ils se dispatchent en
+    # parallèle au lieu de se sérialiser derrière le clic ou la
+    # recherche d'un autre utilisateur.
+    app.add_handlers([
+        CommandHandler("start", start),
+        CommandHandler("help", help_command),
+        CommandHandler("stats", stats_command),
+        CommandHandler("clearcache", clear_cache),
+        CommandHandler("setfooter", set_footer),
+        CommandHandler("setlang", set_language),
+        CommandHandler("anime", anime_command, block=False),
+        CommandHandler("movie", movie_command, block=False),
+        CallbackQueryHandler(button_callback, block=False),
+    ])
     
     # Error handler
     app.add_error_handler(error_handler)
     
     # Démarrage
-    if ENVIRONMENT == "production" and WEBHOOK_URL:
-        logger.info(f"🌐 Mode webhook: {WEBHOOK_URL}/webhook")
-        app.run_webhook(
-            listen="0.0.0.0",
-            port=PORT,
-            url_path="/webhook",
-            webhook_url=f"{WEBHOOK_URL}/webhook",
-            allowed_updates=Update.ALL_TYPES
-        )
+    if run_as_webhook:
+        logger.info("🌐 Mode webhook: %s/webhook", WEBHOOK_URL)
+        _run_webhook_asgi(app)
     else:
         logger.info("🔄 Mode polling (développement)")
-        app.run_polling(allowed_updates=Update.ALL_TYPES)
+        # Long-poll de 30 s relancé sans délai : getUpdates rend la main
+        # dès qu'un update arrive, avec 3x moins de requêtes qu'avec les
+        # timeouts par défaut. Les updates accumulés pendant un arrêt
+        # sont ignorés au redémarrage.
+        app.run_polling(
+            allowed_updates=Update.ALL_TYPES,
+            poll_interval=0.0,
+            timeout=30,
+            drop_pending_updates=True
+        )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file